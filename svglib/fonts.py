@@ -6,7 +6,7 @@ import os
 import subprocess
 import sys
 
-from reportlab.pdfbase.pdfmetrics import registerFont
+from reportlab.pdfbase.pdfmetrics import getFont, getRegisteredFontNames, registerFont
 from reportlab.pdfbase.ttfonts import TTFError, TTFont
 
 STANDARD_FONT_NAMES = (
@@ -243,3 +243,27 @@ def register_font_family(self, family, normal,  bold=None, italic=None, boldital
 
 def get_global_font_map():
     return _font_map
+
+
+def get_registered_ttf_fonts():
+    """
+    Return the TrueType fonts registered in reportlab, as a dict mapping the
+    font names to their file paths.
+    """
+    fonts = {}
+    for name in getRegisteredFontNames():
+        font = getFont(name)
+        if isinstance(font, TTFont):
+            fonts[name] = font.face.filename
+    return fonts
+
+
+def register_ttf_fonts(fonts):
+    """
+    Register in reportlab the fonts of a dict mapping font names to file paths,
+    as returned by get_registered_ttf_fonts(), unless already registered.
+    """
+    registered = set(getRegisteredFontNames())
+    for name, font_path in fonts.items():
+        if name not in registered:
+            registerFont(TTFont(name, font_path))
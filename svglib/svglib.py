@@ -15,6 +15,7 @@ gzip and extension .svgz).
 
 import base64
 import copy
+import functools
 import gzip
 import itertools
 import logging
@@ -22,7 +23,7 @@ import os
 import pathlib
 import re
 import shlex
-import shutil
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from collections import defaultdict, namedtuple
 from PIL import Image as PILImage
@@ -32,7 +33,7 @@ from reportlab.pdfgen.canvas import FILL_EVEN_ODD, FILL_NON_ZERO
 from reportlab.pdfgen.pdfimages import PDFImage
 from reportlab.graphics.shapes import (
     _CLOSEPATH, Circle, Drawing, Ellipse, Group, Image, Line, Path, PolyLine,
-    Polygon, Rect, SolidShape, String,
+    Polygon, Rect, SolidShape, String, rotate,
 )
 from reportlab.lib import colors
 from reportlab.lib.units import pica, toLength
@@ -47,14 +48,13 @@ from lxml import etree
 import cssselect2
 import tinycss2
 
-from .utils import (
-    bezier_arc_from_end_points, convert_quadratic_to_cubic_path,
-    normalise_svg_path,
-)
+from .utils import bezier_arc_from_end_points, iter_svg_path
+# Kept importable from here for backward compatibility
+from .utils import convert_quadratic_to_cubic_path, normalise_svg_path  # noqa: F401
 
 from .fonts import (
-    get_global_font_map, DEFAULT_FONT_NAME, DEFAULT_FONT_WEIGHT, DEFAULT_FONT_STYLE,
-    DEFAULT_FONT_SIZE,
+    get_global_font_map, get_registered_ttf_fonts, register_ttf_fonts,
+    DEFAULT_FONT_NAME, DEFAULT_FONT_WEIGHT, DEFAULT_FONT_STYLE, DEFAULT_FONT_SIZE,
 )
 
 # To keep backward compatibility, since those functions where previously part of the svglib module
@@ -86,6 +86,36 @@ logger = logging.getLogger(__name__)
 Box = namedtuple('Box', ['x', 'y', 'width', 'height'])
 
 split_whitespace = re.compile(r'[^ \t\r\n\f]+').findall
+# Split a list of lengths/numbers separated by whitespace and/or commas.
+split_lengths = re.compile(r'[^\s,]+').findall
+replace_spaces = re.compile('[ ]+').sub
+iter_brackets = re.compile('[()]').finditer
+match_image_data_uri = re.compile(r"^data:image/(jpe?g|png);base64").match
+match_url_fragment = re.compile(r'url\(#([^\)]*)\)').match
+
+# Style attributes applied on shapes by applyStyleOnShape, in the format:
+# (svgAttributes, rlgAttr, converter, defaults)
+STYLE_MAPPING_N = (
+    (("fill",), "fillColor", "convertColor", ("black",)),
+    (("fill-opacity",), "fillOpacity", "convertOpacity", (1,)),
+    (("fill-rule",), "_fillRule", "convertFillRule", ("nonzero",)),
+    (("stroke",), "strokeColor", "convertColor", ("none",)),
+    (("stroke-width",), "strokeWidth", "convertLength", ("1",)),
+    (("stroke-opacity",), "strokeOpacity", "convertOpacity", (1,)),
+    (("stroke-linejoin",), "strokeLineJoin", "convertLineJoin", ("0",)),
+    (("stroke-linecap",), "strokeLineCap", "convertLineCap", ("0",)),
+    (("stroke-dasharray",), "strokeDashArray", "convertDashArray", ("none",)),
+)
+# Additional style attributes applied on String shapes.
+STYLE_MAPPING_F = (
+    (
+        ("font-family", "font-weight", "font-style"),
+        "fontName", "convertFontFamily",
+        (DEFAULT_FONT_NAME, DEFAULT_FONT_WEIGHT, DEFAULT_FONT_STYLE),
+    ),
+    (("font-size",), "fontSize", "convertLength", (str(DEFAULT_FONT_SIZE),)),
+    (("text-anchor",), "textAnchor", "id", ("start",)),
+)
 
 
 class NoStrokePath(Path):
@@ -95,9 +125,10 @@ class NoStrokePath(Path):
     """
     def __init__(self, *args, **kwargs):
         copy_from = kwargs.pop('copy_from', None)
+        shared = kwargs.pop('shared', ())
         super().__init__(*args, **kwargs)
         if copy_from:
-            self.__dict__.update(copy.deepcopy(copy_from.__dict__))
+            self.__dict__.update(copy_shape_state(copy_from, shared=shared))
 
     def getProperties(self, *args, **kwargs):
         # __getattribute__ wouldn't suit, as RL is directly accessing self.__dict__
@@ -114,7 +145,7 @@ class ClippingPath(Path):
         copy_from = kwargs.pop('copy_from', None)
         Path.__init__(self, *args, **kwargs)
         if copy_from:
-            self.__dict__.update(copy.deepcopy(copy_from.__dict__))
+            self.__dict__.update(copy_shape_state(copy_from))
         self.isClipPath = 1
 
     def getProperties(self, *args, **kwargs):
@@ -126,6 +157,52 @@ class ClippingPath(Path):
         return props
 
 
+class LazyImage(Image):
+    """
+    An image shape for embedded image data (a data URI), only decoded to a PIL
+    image the first time `path` is read (typically when the drawing is rendered).
+    `decoded` is a dict which can be shared by the images of a document, so that
+    identical data is only decoded once.
+    """
+    def __init__(self, x, y, width, height, path, decoded=None, node_desc='<image>'):
+        super().__init__(x, y, width, height, path)
+        self._decoded = {} if decoded is None else decoded
+        self._node_desc = node_desc
+
+    @property
+    def path(self):
+        path = self.__dict__.get('path')
+        if isinstance(path, str) and match_image_data_uri(path):
+            path = self.__dict__['path'] = self._decode(path)
+        return path
+
+    @path.setter
+    def path(self, value):
+        self.__dict__['path'] = value
+
+    def _decode(self, data_uri):
+        try:
+            return self._decoded[data_uri]
+        except KeyError:
+            pass
+        match = match_image_data_uri(data_uri)
+        try:
+            image_data = base64.b64decode(data_uri[(match.end() + 1):])
+            image = PILImage.open(BytesIO(image_data))
+        except (ValueError, OSError) as err:
+            logger.error("Unable to decode the embedded image of %s: %s", self._node_desc, err)
+            image = None
+        self._decoded[data_uri] = image
+        return image
+
+    def __getstate__(self):
+        # Pickle the decoded image, not the data nor the shared decoded dict.
+        self.path
+        state = self.__dict__.copy()
+        state['_decoded'] = {}
+        return state
+
+
 class CSSMatcher(cssselect2.Matcher):
     def add_styles(self, style_content):
         rules = tinycss2.parse_stylesheet(
@@ -155,6 +232,8 @@ class AttributeConverter:
     def __init__(self):
         self.css_rules = None
         self.main_box = None
+        # Values found by findAttr, keyed by (element, attribute name).
+        self._found_attrs = {}
 
     def set_box(self, main_box):
         self.main_box = main_box
@@ -165,17 +244,7 @@ class AttributeConverter:
         Return a dictionary with single attributes in 'line'.
         """
 
-        attrs = line.split(';')
-        attrs = [a.strip() for a in attrs]
-        attrs = filter(lambda a: len(a) > 0, attrs)
-
-        new_attrs = {}
-        for a in attrs:
-            k, v = a.split(':')
-            k, v = [s.strip() for s in (k, v)]
-            new_attrs[k] = v
-
-        return new_attrs
+        return dict(parse_style(line))
 
     def findAttr(self, svgNode, name):
         """Search an attribute with some name in some node or above.
@@ -187,26 +256,41 @@ class AttributeConverter:
 
         # This needs also to lookup values like "url(#SomeName)"...
 
-        if not svgNode.attrib.get('__rules_applied', False):
-            # Apply global styles...
-            if self.css_rules is not None:
-                svgNode.apply_rules(self.css_rules)
-            # ...and locally defined
-            if svgNode.attrib.get("style"):
-                attrs = self.parseMultiAttributes(svgNode.attrib.get("style"))
-                for key, val in attrs.items():
-                    # lxml nodes cannot accept attributes starting with '-'
-                    if not key.startswith('-'):
-                        svgNode.attrib[key] = val
-                svgNode.attrib['__rules_applied'] = '1'
-
-        attr_value = svgNode.attrib.get(name, '').strip()
-
-        if attr_value and attr_value != "inherit":
-            return attr_value
-        if svgNode.parent is not None:
-            return self.findAttr(svgNode.parent, name)
-        return ''
+        found_attrs = self._found_attrs
+        visited = []
+        attr_value = ''
+        while svgNode is not None:
+            key = (svgNode.etree_element, name)
+            if key in found_attrs:
+                attr_value = found_attrs[key]
+                break
+            visited.append(key)
+            attrib = svgNode.attrib
+            if not attrib.get('__rules_applied', False):
+                # Apply global styles...
+                if self.css_rules is not None:
+                    svgNode.apply_rules(self.css_rules)
+                # ...and locally defined
+                if attrib.get("style"):
+                    attrs = self.parseMultiAttributes(attrib.get("style"))
+                    for style_key, style_val in attrs.items():
+                        # lxml nodes cannot accept attributes starting with '-'
+                        if not style_key.startswith('-'):
+                            attrib[style_key] = style_val
+                # Mark the node so its styles are only parsed once
+                attrib['__rules_applied'] = '1'
+
+            attr_value = attrib.get(name, '').strip()
+
+            if attr_value and attr_value != "inherit":
+                break
+            attr_value = ''
+            svgNode = svgNode.parent
+
+        # Remember the value for the node and the ancestors traversed so far
+        for key in visited:
+            found_attrs[key] = attr_value
+        return attr_value
 
     def getAllAttributes(self, svgNode):
         "Return a dictionary of all attributes of svgNode or those inherited by it."
@@ -240,18 +324,17 @@ class AttributeConverter:
 
         line = svgAttr.strip()
 
-        ops = line[:]
-        brackets = []
+        # Text outside of the successfully parsed brackets, holding the ops
+        op_parts = []
+        op_start = 0
+        brackets = [m.start() for m in iter_brackets(line)]
         indices = []
-        for i, lin in enumerate(line):
-            if lin in "()":
-                brackets.append(i)
         for i in range(0, len(brackets), 2):
             bi, bj = brackets[i], brackets[i+1]
             subline = line[bi+1:bj]
             subline = subline.strip()
             subline = subline.replace(',', ' ')
-            subline = re.sub("[ ]+", ',', subline)
+            subline = replace_spaces(',', subline)
             try:
                 if ',' in subline:
                     indices.append(tuple(float(num) for num in subline.split(',')))
@@ -259,8 +342,10 @@ class AttributeConverter:
                     indices.append(float(subline))
             except ValueError:
                 continue
-            ops = ops[:bi] + ' '*(bj-bi+1) + ops[bj+1:]
-        ops = ops.replace(',', ' ').split()
+            op_parts.append(line[op_start:bi])
+            op_start = bj + 1
+        op_parts.append(line[op_start:])
+        ops = ' '.join(op_parts).replace(',', ' ').split()
 
         if len(ops) != len(indices):
             logger.warning("Unable to parse transform expression %r", svgAttr)
@@ -280,6 +365,7 @@ class Svg2RlgAttributeConverter(AttributeConverter):
         super().__init__()
         self.color_converter = color_converter or self.identity_color_converter
         self._font_map = font_map or get_global_font_map()
+        self._font_family_cache = {}
 
     @staticmethod
     def identity_color_converter(c):
@@ -299,9 +385,15 @@ class Svg2RlgAttributeConverter(AttributeConverter):
             # Multiple length values, returning a list
             return [
                 self.convertLength(val, em_base=em_base, attr_name=attr_name, default=default)
-                for val in self.split_attr_list(text)
+                for val in split_lengths(text)
             ]
 
+        try:
+            # Fast path for the most common case, a unit-less number.
+            return float(text)
+        except ValueError:
+            pass
+
         if text.endswith('%'):
             if self.main_box is None:
                 logger.error("Unable to resolve percentage unit without a main box")
@@ -334,14 +426,18 @@ class Svg2RlgAttributeConverter(AttributeConverter):
             # wide when the text cannot be measured.
             return float(text[:-2]) * em_base / 2
 
-        text = text.strip()
         length = toLength(text)  # this does the default measurements such as mm and cm
 
         return length
 
     def convertLengthList(self, svgAttr):
         """Convert a list of lengths."""
-        return [self.convertLength(a) for a in self.split_attr_list(svgAttr)]
+        values = split_lengths(svgAttr)
+        try:
+            # Fast path for lists of unit-less numbers, like polyline points.
+            return list(map(float, values))
+        except ValueError:
+            return [self.convertLength(a) for a in values]
 
     def convertOpacity(self, svgAttr):
         return float(svgAttr)
@@ -363,27 +459,12 @@ class Svg2RlgAttributeConverter(AttributeConverter):
 
         if text == "currentColor":
             return "currentColor"
-        if len(text) in (7, 9) and text[0] == '#':
-            color = colors.HexColor(text, hasAlpha=len(text) == 9)
-        elif len(text) == 4 and text[0] == '#':
-            color = colors.HexColor('#' + 2*text[1] + 2*text[2] + 2*text[3])
-        elif len(text) == 5 and text[0] == '#':
-            color = colors.HexColor(
-                '#' + 2*text[1] + 2*text[2] + 2*text[3] + 2*text[4], hasAlpha=True
-            )
-        else:
-            # Should handle pcmyk|cmyk|rgb|hsl values (including 'a' for alpha)
-            color = colors.cssParse(text)
-            if color is None:
-                # Test if text is a predefined color constant
-                try:
-                    color = getattr(colors, text).clone()
-                except AttributeError:
-                    pass
+        color = parse_color(text)
         if color is None:
             logger.warning("Can't handle color: %s", text)
         else:
-            return self.color_converter(color)
+            # Cached colors are shared, callers get their own (mutable) copy.
+            return self.color_converter(color.clone())
 
     def convertLineJoin(self, svgAttr):
         return {"miter": 0, "round": 1, "bevel": 2}[svgAttr]
@@ -402,6 +483,14 @@ class Svg2RlgAttributeConverter(AttributeConverter):
     def convertFontFamily(self, fontAttr, weightAttr='normal', styleAttr='normal'):
         if not fontAttr:
             return ''
+        key = (fontAttr, weightAttr, styleAttr)
+        try:
+            return self._font_family_cache[key]
+        except KeyError:
+            font_name = self._font_family_cache[key] = self._findFontFamily(*key)
+            return font_name
+
+    def _findFontFamily(self, fontAttr, weightAttr, styleAttr):
         # split the fontAttr in actual font family names
         font_names = self.split_attr_list(fontAttr)
 
@@ -416,8 +505,8 @@ class Svg2RlgAttributeConverter(AttributeConverter):
             return non_exact_matches[0]
         else:
             logger.warning(
-                f"Unable to find a suitable font for 'font-family:{fontAttr}', "
-                f"weight:{weightAttr}, style:{styleAttr}"
+                "Unable to find a suitable font for 'font-family:%s', weight:%s, style:%s",
+                fontAttr, weightAttr, styleAttr
             )
             return DEFAULT_FONT_NAME
 
@@ -426,20 +515,19 @@ class NodeTracker(cssselect2.ElementWrapper):
     """An object wrapper keeping track of arguments to certain method calls.
 
     Instances wrap an object and store all arguments to one special
-    method, getAttribute(name), in a list of unique elements, usedAttrs.
+    method, getAttribute(name), in a set, usedAttrs.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.usedAttrs = []
+        self.usedAttrs = set()
 
     def __repr__(self):
         return f'<NodeTracker for node {self.etree_element}>'
 
     def getAttribute(self, name):
-        # add argument to the history, if not already present
-        if name not in self.usedAttrs:
-            self.usedAttrs.append(name)
+        # add argument to the history
+        self.usedAttrs.add(name)
         # forward call to wrapped object
         return self.etree_element.attrib.get(name, '')
 
@@ -495,7 +583,7 @@ class SvgRenderer:
             color_converter=color_converter, font_map=font_map
         )
         self.shape_converter = Svg2RlgShapeConverter(path, self.attrConverter)
-        self.handled_shapes = self.shape_converter.get_handled_shapes()
+        self.handled_shapes = frozenset(self.shape_converter.get_handled_shapes())
         self.definitions = {}
         self.waiting_use_nodes = defaultdict(list)
         self._external_svgs = {}
@@ -508,7 +596,7 @@ class SvgRenderer:
         self.attrConverter.set_box(view_box)
 
         main_group = self.renderSvg(node, outermost=True)
-        for xlink in self.waiting_use_nodes.keys():
+        for xlink in self.waiting_use_nodes:
             logger.debug("Ignoring unavailable object width ID %r.", xlink)
 
         main_group.translate(0 - view_box.x, -view_box.height - view_box.y)
@@ -521,13 +609,38 @@ class SvgRenderer:
         return drawing
 
     def renderNode(self, node, parent=None):
-        nid = node.getAttribute("id")
+        getAttr = node.getAttribute
+        nid = getAttr("id")
         ignored = False
         item = None
         name = node_name(node)
 
         clipping = self.get_clippath(node)
-        if name == "svg":
+        # Shapes are by far the most frequent nodes, so they are tested first.
+        if name in self.handled_shapes:
+            if name == 'image':
+                # We resolve the image target at renderer level because it can point
+                # to another SVG file or node which has to be rendered too.
+                target = self.xlink_href_target(node)
+                if target is None:
+                    return
+                elif isinstance(target, tuple):
+                    # This is SVG content needed to be rendered
+                    gr = Group()
+                    renderer, img_node = target
+                    renderer.renderNode(img_node, parent=gr)
+                    self.apply_node_attr_to_group(node, gr)
+                    parent.add(gr)
+                    return
+                else:
+                    # Attaching target to node, so we can get it back in convertImage
+                    node._resolved_target = target
+
+            item = self.shape_converter.convertShape(name, node, clipping)
+            display = getAttr("display")
+            if item and display != "none":
+                parent.add(item)
+        elif name == "svg":
             item = self.renderSvg(node)
             parent.add(item)
         elif name == "defs":
@@ -536,7 +649,7 @@ class SvgRenderer:
             item = self.renderA(node)
             parent.add(item)
         elif name == 'g':
-            display = node.getAttribute("display")
+            display = getAttr("display")
             item = self.renderG(node, clipping=clipping)
             if display != "none":
                 parent.add(item)
@@ -555,29 +668,6 @@ class SvgRenderer:
             parent.add(item)
         elif name == "clipPath":
             item = self.renderG(node)
-        elif name in self.handled_shapes:
-            if name == 'image':
-                # We resolve the image target at renderer level because it can point
-                # to another SVG file or node which has to be rendered too.
-                target = self.xlink_href_target(node)
-                if target is None:
-                    return
-                elif isinstance(target, tuple):
-                    # This is SVG content needed to be rendered
-                    gr = Group()
-                    renderer, img_node = target
-                    renderer.renderNode(img_node, parent=gr)
-                    self.apply_node_attr_to_group(node, gr)
-                    parent.add(gr)
-                    return
-                else:
-                    # Attaching target to node, so we can get it back in convertImage
-                    node._resolved_target = target
-
-            item = self.shape_converter.convertShape(name, node, clipping)
-            display = node.getAttribute("display")
-            if item and display != "none":
-                parent.add(item)
         else:
             ignored = True
             logger.debug("Ignoring node: %s", name)
@@ -594,7 +684,7 @@ class SvgRenderer:
                 if len(label_attrs) == 1:
                     label, = label_attrs
                     item.setProperties({'label': label})
-            if nid in self.waiting_use_nodes.keys():
+            if nid in self.waiting_use_nodes:
                 to_render = self.waiting_use_nodes.pop(nid)
                 for use_node, group in to_render:
                     self.renderUse(use_node, group=group)
@@ -628,7 +718,7 @@ class SvgRenderer:
         clip_path = node.getAttribute('clip-path')
         if not clip_path:
             return
-        m = re.match(r'url\(#([^\)]*)\)', clip_path)
+        m = match_url_fragment(clip_path)
         if not m:
             return
         ref = m.groups()[0]
@@ -659,7 +749,7 @@ class SvgRenderer:
             )
 
     def print_unused_attributes(self, node):
-        if logger.level > logging.DEBUG:
+        if not logger.isEnabledFor(logging.DEBUG):
             return
         all_attrs = self.attrConverter.getAllAttributes(node.etree_element).keys()
         unused_attrs = [attr for attr in all_attrs if attr not in node.usedAttrs]
@@ -667,19 +757,24 @@ class SvgRenderer:
             logger.debug("Unused attrs: %s %s", node_name(node), unused_attrs)
 
     def apply_node_attr_to_group(self, node, group):
-        getAttr = node.getAttribute
-        transform, x, y = map(getAttr, ("transform", "x", "y"))
-        if x or y:
-            transform += f" translate({x or 0}, {y or 0})"
+        transform = node.getAttribute("transform")
+        try:
+            x, y = self.shape_converter.convert_length_attrs(node, "x", "y")
+        except ValueError as err:
+            logger.warning("Ignoring invalid x/y position on %s: %s", node_name(node), err)
+            x = y = 0
         if transform:
             self.shape_converter.applyTransformOnGroup(transform, group)
+        if x or y:
+            # Applied directly, rather than appended to the transform string
+            group.translate(x, y)
 
     def xlink_href_target(self, node, group=None):
         """
         Return either:
             - a tuple (renderer, node) when the the xlink:href attribute targets
               a vector file or node
-            - a PIL Image object representing the image file
+            - the data URI of embedded image data
             - None if any problem occurs
         """
         # Bare 'href' was introduced in SVG 2.
@@ -687,13 +782,10 @@ class SvgRenderer:
         if not xlink_href:
             return None
 
-        # First handle any raster embedded image data
-        match = re.match(r"^data:image/(jpe?g|png);base64", xlink_href)
-        if match:
-            image_data = base64.decodebytes(xlink_href[(match.span(0)[1] + 1):].encode('ascii'))
-            bytes_stream = BytesIO(image_data)
-
-            return PILImage.open(bytes_stream)
+        # First handle any raster embedded image data, whose decoding is
+        # deferred to LazyImage until the image is really needed.
+        if match_image_data_uri(xlink_href):
+            return xlink_href
 
         # From here, we can assume this is a path.
         if '#' in xlink_href:
@@ -779,9 +871,24 @@ class SvgRenderer:
 
         # Rendering all definition nodes first.
         svg_ns = node.nsmap.get(None)
-        for def_node in node.iter_subtree():
-            if def_node.tag == (f'{{{svg_ns}}}defs' if svg_ns else 'defs'):
+        defs_tag = f'{{{svg_ns}}}defs' if svg_ns else 'defs'
+        # Only descend into elements containing some definitions, instead of
+        # wrapping the whole subtree.
+        defs_holders = {
+            ancestor
+            for defs_elem in node.etree_element.iter(defs_tag)
+            for ancestor in defs_elem.iterancestors()
+        }
+        stack = [iter([node])]
+        while stack:
+            def_node = next(stack[-1], None)
+            if def_node is None:
+                stack.pop()
+                continue
+            if def_node.tag == defs_tag:
                 self.renderG(def_node)
+            if def_node.etree_element in defs_holders:
+                stack.append(def_node.iter_children())
 
         group = Group()
         for child in node.iter_children():
@@ -818,8 +925,9 @@ class SvgRenderer:
         gr = Group()
         if clipping:
             gr.add(clipping)
+        renderNode = self.renderNode
         for child in node.iter_children():
-            self.renderNode(child, parent=gr)
+            renderNode(child, parent=gr)
 
         if transform:
             self.shape_converter.applyTransformOnGroup(transform, gr)
@@ -858,7 +966,7 @@ class SvgRenderer:
 
         if clipping:
             group.add(clipping)
-        if len(node.getchildren()) == 0:
+        if len(node.etree_element) == 0:
             # Append a copy of the referenced node as the <use> child (if not already done)
             node.append(copy.deepcopy(item))
         self.renderNode(list(node.iter_children())[-1], parent=group)
@@ -880,21 +988,44 @@ class SvgShapeConverter:
         self.attrConverter = attrConverter or Svg2RlgAttributeConverter()
         self.svg_source_file = path
         self.preserve_space = False
+        # Embedded images decoded by LazyImage, keyed by data URI.
+        self._embedded_images = {}
+        # Map shape element names to their bound convert<Shape> methods.
+        self._shape_converters = {
+            name: getattr(self, f"convert{name.capitalize()}")
+            for name in self.get_handled_shapes()
+        }
+        # Style mappings with their converters resolved to bound methods
+        # of the attribute converter (skipped if it has no such method).
+        self._style_mapping_n, self._style_mapping_f = [
+            tuple(
+                (svgAttrNames, rlgAttr, getattr(self.attrConverter, func), defaults)
+                for svgAttrNames, rlgAttr, func, defaults in mapping
+                if hasattr(self.attrConverter, func)
+            )
+            for mapping in (STYLE_MAPPING_N, STYLE_MAPPING_F)
+        ]
+        # String shapes also get the font related styles.
+        self._style_mapping_text = self._style_mapping_n + self._style_mapping_f
 
     @classmethod
     def get_handled_shapes(cls):
         """Dynamically determine a list of handled shape elements based on
            convert<shape> method existence.
         """
-        return [key[7:].lower() for key in dir(cls) if key.startswith('convert')]
+        # Computed once per class, as scanning dir() is relatively slow.
+        if '_handled_shapes' not in cls.__dict__:
+            cls._handled_shapes = tuple(
+                key[7:].lower() for key in dir(cls) if key.startswith('convert')
+            )
+        return list(cls._handled_shapes)
 
 
 class Svg2RlgShapeConverter(SvgShapeConverter):
     """Converter from SVG shapes to RLG (ReportLab Graphics) shapes."""
 
     def convertShape(self, name, node, clipping=None):
-        method_name = f"convert{name.capitalize()}"
-        shape = getattr(self, method_name)(node)
+        shape = self._shape_converters[name](node)
         if not shape:
             return
         if name not in ('path', 'polyline', 'text'):
@@ -920,10 +1051,17 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
         )
         convLength = self.attrConverter.convertLength
         defaults = kwargs.get('defaults', (0.0,) * len(attrs))
-        return [
-            convLength(getAttr(attr), attr_name=attr, em_base=em_base, default=default)
-            for attr, default in zip(attrs, defaults)
-        ]
+        lengths = []
+        for attr, default in zip(attrs, defaults):
+            value = getAttr(attr)
+            try:
+                # Unit-less numbers need no further processing.
+                lengths.append(float(value))
+            except ValueError:
+                lengths.append(
+                    convLength(value, attr_name=attr, em_base=em_base, default=default)
+                )
+        return lengths
 
     def convertLine(self, node):
         points = self.convert_length_attrs(node, 'x1', 'y1', 'x2', 'y2')
@@ -955,10 +1093,7 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
         return Ellipse(cx, cy, width, height)
 
     def convertPolyline(self, node):
-        points = node.getAttribute("points")
-        points = points.replace(',', ' ')
-        points = points.split()
-        points = list(map(self.attrConverter.convertLength, points))
+        points = self.attrConverter.convertLengthList(node.getAttribute("points"))
         if len(points) % 2 != 0 or len(points) == 0:
             # Odd number of coordinates or no coordinates, invalid polyline
             return None
@@ -982,10 +1117,7 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
         return polyline
 
     def convertPolygon(self, node):
-        points = node.getAttribute("points")
-        points = points.replace(',', ' ')
-        points = points.split()
-        points = list(map(self.attrConverter.convertLength, points))
+        points = self.attrConverter.convertLengthList(node.getAttribute("points"))
         if len(points) % 2 != 0 or len(points) == 0:
             # Odd number of coordinates or no coordinates, invalid polygon
             return None
@@ -1004,7 +1136,8 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
 
         gr = Group()
 
-        frag_lengths = []
+        # Width of the text fragments already rendered.
+        frag_offset = 0
 
         dx0, dy0 = 0, 0
         x1, y1 = 0, 0
@@ -1015,9 +1148,12 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
         fs = attrConv.findAttr(node, "font-size") or str(DEFAULT_FONT_SIZE)
         fs = attrConv.convertLength(fs)
         x, y = self.convert_length_attrs(node, 'x', 'y', em_base=fs)
+        # Style attributes of the text node, shared by all its fragments.
+        node_attrs = {}
         for subnode, text, is_tail in iter_text_node(node, preserve_space):
             if not text:
                 continue
+            subnode_attrs = {}
             has_x, has_y = False, False
             dx, dy = 0, 0
             baseLineShift = 0
@@ -1032,14 +1168,14 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
             else:
                 baseLineShift = attrConv.convertLength(baseLineShift, em_base=fs)
 
-            frag_lengths.append(stringWidth(text, ff, fs))
+            frag_length = stringWidth(text, ff, fs)
 
             # When x, y, dx, or dy is a list, we calculate position for each char of text.
             if any(isinstance(val, list) for val in (x1, y1, dx, dy)):
                 if has_x:
                     xlist = x1 if isinstance(x1, list) else [x1]
                 else:
-                    xlist = [x + dx0 + sum(frag_lengths[:-1])]
+                    xlist = [x + dx0 + frag_offset]
                 if has_y:
                     ylist = y1 if isinstance(y1, list) else [y1]
                 else:
@@ -1060,22 +1196,24 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
                     )
                     new_y = char_dy + (last_y if char_y is None else char_y)
                     shape = String(new_x, -(new_y - baseLineShift), char)
-                    self.applyStyleOnShape(shape, node)
+                    self.applyStyleOnShape(shape, node, found_attrs=node_attrs)
                     if node_name(subnode) == 'tspan':
-                        self.applyStyleOnShape(shape, subnode)
+                        self.applyStyleOnShape(shape, subnode, found_attrs=subnode_attrs)
                     gr.add(shape)
                     last_x = new_x
                     last_y = new_y
                     last_char = char
             else:
-                new_x = (x1 + dx) if has_x else (x + dx0 + sum(frag_lengths[:-1]))
+                new_x = (x1 + dx) if has_x else (x + dx0 + frag_offset)
                 new_y = (y1 + dy) if has_y else (y + dy0)
                 shape = String(new_x, -(new_y - baseLineShift), text)
-                self.applyStyleOnShape(shape, node)
+                self.applyStyleOnShape(shape, node, found_attrs=node_attrs)
                 if node_name(subnode) == 'tspan':
-                    self.applyStyleOnShape(shape, subnode)
+                    self.applyStyleOnShape(shape, subnode, found_attrs=subnode_attrs)
                 gr.add(shape)
 
+            frag_offset += frag_length
+
         gr.scale(1, -1)
 
         return gr
@@ -1084,152 +1222,39 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
         d = node.get('d')
         if not d:
             return None
-        normPath = normalise_svg_path(d)
         path = Path()
-        points = path.points
         # Track subpaths needing to be closed later
         unclosed_subpath_pointers = []
-        subpath_start = []
-        lastop = ''
-        last_quadratic_cp = None
+        state = PathState()
+        get_path_op = PATH_OPS.get
+        skipped_ops = False
 
-        for i in range(0, len(normPath), 2):
-            op, nums = normPath[i:i+2]
+        for op, nums in iter_svg_path(d):
 
-            if op in ('m', 'M') and i > 0 and path.operators[-1] != _CLOSEPATH:
-                unclosed_subpath_pointers.append(len(path.operators))
-
-            # moveto absolute
-            if op == 'M':
-                path.moveTo(*nums)
-                subpath_start = points[-2:]
-            # lineto absolute
-            elif op == 'L':
-                path.lineTo(*nums)
-
-            # moveto relative
-            elif op == 'm':
-                if len(points) >= 2:
-                    if lastop in ('Z', 'z'):
-                        starting_point = subpath_start
-                    else:
-                        starting_point = points[-2:]
-                    xn, yn = starting_point[0] + nums[0], starting_point[1] + nums[1]
-                    path.moveTo(xn, yn)
-                else:
-                    path.moveTo(*nums)
-                subpath_start = points[-2:]
-            # lineto relative
-            elif op == 'l':
-                xn, yn = points[-2] + nums[0], points[-1] + nums[1]
-                path.lineTo(xn, yn)
-
-            # horizontal/vertical line absolute
-            elif op == 'H':
-                path.lineTo(nums[0], points[-1])
-            elif op == 'V':
-                path.lineTo(points[-2], nums[0])
-
-            # horizontal/vertical line relative
-            elif op == 'h':
-                path.lineTo(points[-2] + nums[0], points[-1])
-            elif op == 'v':
-                path.lineTo(points[-2], points[-1] + nums[0])
-
-            # cubic bezier, absolute
-            elif op == 'C':
-                path.curveTo(*nums)
-            elif op == 'S':
-                x2, y2, xn, yn = nums
-                if len(points) < 4 or lastop not in {'c', 'C', 's', 'S'}:
-                    xp, yp, x0, y0 = points[-2:] * 2
-                else:
-                    xp, yp, x0, y0 = points[-4:]
-                xi, yi = x0 + (x0 - xp), y0 + (y0 - yp)
-                path.curveTo(xi, yi, x2, y2, xn, yn)
-
-            # cubic bezier, relative
-            elif op == 'c':
-                xp, yp = points[-2:]
-                x1, y1, x2, y2, xn, yn = nums
-                path.curveTo(xp + x1, yp + y1, xp + x2, yp + y2, xp + xn, yp + yn)
-            elif op == 's':
-                x2, y2, xn, yn = nums
-                if len(points) < 4 or lastop not in {'c', 'C', 's', 'S'}:
-                    xp, yp, x0, y0 = points[-2:] * 2
-                else:
-                    xp, yp, x0, y0 = points[-4:]
-                xi, yi = x0 + (x0 - xp), y0 + (y0 - yp)
-                path.curveTo(xi, yi, x0 + x2, y0 + y2, x0 + xn, y0 + yn)
-
-            # quadratic bezier, absolute
-            elif op == 'Q':
-                x0, y0 = points[-2:]
-                x1, y1, xn, yn = nums
-                last_quadratic_cp = (x1, y1)
-                (x0, y0), (x1, y1), (x2, y2), (xn, yn) = \
-                    convert_quadratic_to_cubic_path((x0, y0), (x1, y1), (xn, yn))
-                path.curveTo(x1, y1, x2, y2, xn, yn)
-            elif op == 'T':
-                if last_quadratic_cp is not None:
-                    xp, yp = last_quadratic_cp
-                else:
-                    xp, yp = points[-2:]
-                x0, y0 = points[-2:]
-                xi, yi = x0 + (x0 - xp), y0 + (y0 - yp)
-                last_quadratic_cp = (xi, yi)
-                xn, yn = nums
-                (x0, y0), (x1, y1), (x2, y2), (xn, yn) = \
-                    convert_quadratic_to_cubic_path((x0, y0), (xi, yi), (xn, yn))
-                path.curveTo(x1, y1, x2, y2, xn, yn)
-
-            # quadratic bezier, relative
-            elif op == 'q':
-                x0, y0 = points[-2:]
-                x1, y1, xn, yn = nums
-                x1, y1, xn, yn = x0 + x1, y0 + y1, x0 + xn, y0 + yn
-                last_quadratic_cp = (x1, y1)
-                (x0, y0), (x1, y1), (x2, y2), (xn, yn) = \
-                    convert_quadratic_to_cubic_path((x0, y0), (x1, y1), (xn, yn))
-                path.curveTo(x1, y1, x2, y2, xn, yn)
-            elif op == 't':
-                if last_quadratic_cp is not None:
-                    xp, yp = last_quadratic_cp
-                else:
-                    xp, yp = points[-2:]
-                x0, y0 = points[-2:]
-                xn, yn = nums
-                xn, yn = x0 + xn, y0 + yn
-                xi, yi = x0 + (x0 - xp), y0 + (y0 - yp)
-                last_quadratic_cp = (xi, yi)
-                (x0, y0), (x1, y1), (x2, y2), (xn, yn) = \
-                    convert_quadratic_to_cubic_path((x0, y0), (xi, yi), (xn, yn))
-                path.curveTo(x1, y1, x2, y2, xn, yn)
-
-            # elliptical arc
-            elif op in ('A', 'a'):
-                rx, ry, phi, fA, fS, x2, y2 = nums
-                x1, y1 = points[-2:]
-                if op == 'a':
-                    x2 += x1
-                    y2 += y1
-                if abs(rx) <= 1e-10 or abs(ry) <= 1e-10:
-                    path.lineTo(x2, y2)
-                else:
-                    bp = bezier_arc_from_end_points(x1, y1, rx, ry, phi, fA, fS, x2, y2)
-                    for _, _, x1, y1, x2, y2, xn, yn in bp:
-                        path.curveTo(x1, y1, x2, y2, xn, yn)
+            if not path.operators and op not in MOVE_OPS:
+                # Path data must begin with a moveto, RL would reject it anyway.
+                if not skipped_ops:
+                    logger.warning("Ignoring path commands before the first moveto, from: %s", op)
+                skipped_ops = True
+                continue
 
-            # close path
-            elif op in ('Z', 'z'):
-                path.closePath()
+            if op in MOVE_OPS and path.operators and path.operators[-1] != _CLOSEPATH:
+                unclosed_subpath_pointers.append(len(path.operators))
 
-            else:
+            apply_op = get_path_op(op)
+            if apply_op is None:
                 logger.debug("Suspicious path operator: %s", op)
+            else:
+                apply_op(path, nums, state)
 
-            if op not in ('Q', 'q', 'T', 't'):
-                last_quadratic_cp = None
-            lastop = op
+            if op not in CUBIC_OPS:
+                state.last_cubic_cp = None
+            if op not in QUADRATIC_OPS:
+                state.last_quadratic_cp = None
+            state.lastop = op
+
+        if not path.operators:
+            return None
 
         gr = Group()
         self.applyStyleOnShape(path, node)
@@ -1241,7 +1266,8 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
             # ReportLab doesn't fill unclosed paths, so we are creating a copy
             # of the path with all subpaths closed, but without stroke.
             # https://bitbucket.org/rptlab/reportlab/issues/99/
-            closed_path = NoStrokePath(copy_from=path)
+            # Only the operators differ, so the points list can be shared.
+            closed_path = NoStrokePath(copy_from=path, shared=('points',))
             for pointer in reversed(unclosed_subpath_pointers):
                 closed_path.operators.insert(pointer, _CLOSEPATH)
             gr.add(closed_path)
@@ -1253,7 +1279,14 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
     def convertImage(self, node):
         x, y, width, height = self.convert_length_attrs(node, 'x', 'y', 'width', 'height')
         image = node._resolved_target
-        image = Image(int(x), int(y + height), int(width), int(height), image)
+        if match_image_data_uri(image):
+            image = LazyImage(
+                int(x), int(y + height), int(width), int(height), image,
+                decoded=self._embedded_images,
+                node_desc=f"<{node_name(node)}> at line {node.sourceline or '?'}",
+            )
+        else:
+            image = Image(int(x), int(y + height), int(width), int(height), image)
 
         group = Group(image)
         group.translate(0, (y + height) * 2)
@@ -1272,104 +1305,68 @@ class Svg2RlgShapeConverter(SvgShapeConverter):
 
         tr = self.attrConverter.convertTransform(transform)
         for op, values in tr:
-            if op == "scale":
-                if not isinstance(values, tuple):
-                    values = (values, values)
-                group.scale(*values)
-            elif op == "translate":
-                if isinstance(values, (int, float)):
-                    # From the SVG spec: If <ty> is not provided, it is assumed to be zero.
-                    values = values, 0
-                group.translate(*values)
-            elif op == "rotate":
-                if not isinstance(values, tuple) or len(values) == 1:
-                    group.rotate(values)
-                elif len(values) == 3:
-                    angle, cx, cy = values
-                    group.translate(cx, cy)
-                    group.rotate(angle)
-                    group.translate(-cx, -cy)
-            elif op == "skewX":
-                group.skew(values, 0)
-            elif op == "skewY":
-                group.skew(0, values)
-            elif op == "matrix" and len(values) == 6:
-                group.transform = mmult(group.transform, values)
-            else:
+            apply_op = TRANSFORM_OPS.get(op)
+            if apply_op is None:
                 logger.debug("Ignoring transform: %s %s", op, values)
+            else:
+                apply_op(group, values)
 
-    def applyStyleOnShape(self, shape, node, only_explicit=False):
+    def applyStyleOnShape(self, shape, node, only_explicit=False, found_attrs=None):
         """
         Apply styles from an SVG element to an RLG shape.
         If only_explicit is True, only attributes really present are applied.
+        found_attrs is an optional dict caching the node attribute values
+        already looked up, shared when styling several shapes from one node.
         """
 
-        # RLG-specific: all RLG shapes
-        "Apply style attributes of a sequence of nodes to an RL shape."
-
-        # tuple format: (svgAttributes, rlgAttr, converter, default)
-        mappingN = (
-            (["fill"], "fillColor", "convertColor", ["black"]),
-            (["fill-opacity"], "fillOpacity", "convertOpacity", [1]),
-            (["fill-rule"], "_fillRule", "convertFillRule", ["nonzero"]),
-            (["stroke"], "strokeColor", "convertColor", ["none"]),
-            (["stroke-width"], "strokeWidth", "convertLength", ["1"]),
-            (["stroke-opacity"], "strokeOpacity", "convertOpacity", [1]),
-            (["stroke-linejoin"], "strokeLineJoin", "convertLineJoin", ["0"]),
-            (["stroke-linecap"], "strokeLineCap", "convertLineCap", ["0"]),
-            (["stroke-dasharray"], "strokeDashArray", "convertDashArray", ["none"]),
-        )
-        mappingF = (
-            (
-                ["font-family", "font-weight", "font-style"],
-                "fontName", "convertFontFamily",
-                [DEFAULT_FONT_NAME, DEFAULT_FONT_WEIGHT, DEFAULT_FONT_STYLE]
-            ),
-            (["font-size"], "fontSize", "convertLength", [str(DEFAULT_FONT_SIZE)]),
-            (["text-anchor"], "textAnchor", "id", ["start"]),
-        )
-
-        if shape.__class__ == Group:
+        if found_attrs is None:
+            found_attrs = {}
+        if type(shape) is Group:
             # Recursively apply style on Group subelements
             for subshape in shape.contents:
-                self.applyStyleOnShape(subshape, node, only_explicit=only_explicit)
+                self.applyStyleOnShape(
+                    subshape, node, only_explicit=only_explicit, found_attrs=found_attrs
+                )
             return
 
-        ac = self.attrConverter
-        for mapping in (mappingN, mappingF):
-            if shape.__class__ != String and mapping == mappingF:
-                continue
-            for (svgAttrNames, rlgAttr, func, defaults) in mapping:
-                svgAttrValues = []
-                for index, svgAttrName in enumerate(svgAttrNames):
-                    svgAttrValue = ac.findAttr(node, svgAttrName)
-                    if svgAttrValue == '':
-                        if only_explicit:
-                            continue
-                        if (
-                            svgAttrName == 'fill-opacity'
-                            and getattr(shape, 'fillColor', None) is not None
-                            and getattr(shape.fillColor, 'alpha', 1) != 1
-                        ):
-                            svgAttrValue = shape.fillColor.alpha
-                        elif (
-                            svgAttrName == 'stroke-opacity'
-                            and getattr(shape, 'strokeColor', None) is not None
-                            and getattr(shape.strokeColor, 'alpha', 1) != 1
-                        ):
-                            svgAttrValue = shape.strokeColor.alpha
-                        else:
-                            svgAttrValue = defaults[index]
-                    if svgAttrValue == "currentColor":
-                        svgAttrValue = ac.findAttr(node.parent, "color") or defaults[index]
-                    if isinstance(svgAttrValue, str):
-                        svgAttrValue = svgAttrValue.replace('!important', '').strip()
-                    svgAttrValues.append(svgAttrValue)
+        findAttr = self.attrConverter.findAttr
+        if type(shape) is String:
+            mapping = self._style_mapping_text
+        else:
+            mapping = self._style_mapping_n
+        for (svgAttrNames, rlgAttr, convert, defaults) in mapping:
+            svgAttrValues = []
+            for index, svgAttrName in enumerate(svgAttrNames):
                 try:
-                    meth = getattr(ac, func)
-                    setattr(shape, rlgAttr, meth(*svgAttrValues))
-                except (AttributeError, KeyError, ValueError):
-                    logger.debug("Exception during applyStyleOnShape")
+                    svgAttrValue = found_attrs[svgAttrName]
+                except KeyError:
+                    svgAttrValue = found_attrs[svgAttrName] = findAttr(node, svgAttrName)
+                if svgAttrValue == '':
+                    if only_explicit:
+                        continue
+                    if (
+                        svgAttrName == 'fill-opacity'
+                        and getattr(shape, 'fillColor', None) is not None
+                        and getattr(shape.fillColor, 'alpha', 1) != 1
+                    ):
+                        svgAttrValue = shape.fillColor.alpha
+                    elif (
+                        svgAttrName == 'stroke-opacity'
+                        and getattr(shape, 'strokeColor', None) is not None
+                        and getattr(shape.strokeColor, 'alpha', 1) != 1
+                    ):
+                        svgAttrValue = shape.strokeColor.alpha
+                    else:
+                        svgAttrValue = defaults[index]
+                if svgAttrValue == "currentColor":
+                    svgAttrValue = findAttr(node.parent, "color") or defaults[index]
+                if isinstance(svgAttrValue, str):
+                    svgAttrValue = svgAttrValue.replace('!important', '').strip()
+                svgAttrValues.append(svgAttrValue)
+            try:
+                setattr(shape, rlgAttr, convert(*svgAttrValues))
+            except (AttributeError, KeyError, ValueError):
+                logger.debug("Exception during applyStyleOnShape")
         if getattr(shape, 'fillOpacity', None) is not None and shape.fillColor:
             shape.fillColor.alpha = shape.fillOpacity
         if getattr(shape, 'strokeWidth', None) == 0:
@@ -1391,15 +1388,12 @@ def svg2rlg(path, resolve_entities=False, **kwargs):
     if isinstance(path, pathlib.Path):
         path = str(path)
 
-    # unzip .svgz file into .svg
-    unzipped = False
+    # decompress .svgz file on the fly
     if isinstance(path, str) and os.path.splitext(path)[1].lower() == ".svgz":
-        with gzip.open(path, 'rb') as f_in, open(path[:-1], 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
-        path = path[:-1]
-        unzipped = True
-
-    svg_root = load_svg_file(path, resolve_entities=resolve_entities)
+        with gzip.open(path, 'rb') as f_in:
+            svg_root = load_svg_file(f_in, resolve_entities=resolve_entities)
+    else:
+        svg_root = load_svg_file(path, resolve_entities=resolve_entities)
     if svg_root is None:
         return
 
@@ -1407,13 +1401,97 @@ def svg2rlg(path, resolve_entities=False, **kwargs):
     svgRenderer = SvgRenderer(path, **kwargs)
     drawing = svgRenderer.render(svg_root)
 
-    # remove unzipped .svgz file (.svg)
-    if unzipped:
-        os.remove(path)
-
     return drawing
 
 
+def svg2rlg_many(paths, workers=None, chunksize=1, **kwargs):
+    """
+    Convert several SVG files to RLG Drawing objects, in parallel.
+    `paths` is an iterable of file paths as accepted by svg2rlg, and `workers`
+    the maximal number of processes to use (defaults to the number of CPUs).
+    `chunksize` is the number of files sent to a process at once, a higher
+    value reduces the inter-process overhead for many small files.
+    Other keyword arguments are passed to svg2rlg, and as for the paths, they
+    must be picklable (e.g. a lambda as `color_converter` is not).
+    Return a list of drawings (or None for unparsable files) in input order.
+    If the conversion of one file raises an exception, it is raised here and
+    the other results are lost.
+    The fonts registered by the caller are registered in the processes too,
+    and the fonts found by the processes are registered here, so that the
+    drawings can be rendered.
+    """
+    convert = functools.partial(_svg2rlg_in_worker, kwargs=kwargs)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_svg2rlg_worker,
+        initargs=(get_registered_ttf_fonts(), get_global_font_map()),
+    ) as executor:
+        results = list(executor.map(convert, paths, chunksize=chunksize))
+    drawings = []
+    for drawing, fonts in results:
+        register_ttf_fonts(fonts)
+        drawings.append(drawing)
+    return drawings
+
+
+def _init_svg2rlg_worker(fonts, font_map):
+    register_ttf_fonts(fonts)
+    get_global_font_map()._map.update(font_map._map)
+
+
+def _svg2rlg_in_worker(path, kwargs):
+    """
+    Convert an SVG file like svg2rlg, and also return the TrueType fonts
+    registered in the meantime (as a dict of font names to file paths).
+    """
+    fonts_before = get_registered_ttf_fonts()
+    drawing = svg2rlg(path, **kwargs)
+    fonts = {
+        name: font_path for name, font_path in get_registered_ttf_fonts().items()
+        if name not in fonts_before
+    }
+    return drawing, fonts
+
+
+@functools.lru_cache(maxsize=512)
+def parse_style(line):
+    """Return a dictionary of the declarations in the style string `line`.
+
+    Results are cached, so the returned dictionary must not be modified.
+    """
+    attrs = {}
+    for a in line.split(';'):
+        k, sep, v = a.partition(':')
+        if sep:
+            attrs[k.strip()] = v.strip()
+    return attrs
+
+
+@functools.lru_cache(maxsize=512)
+def parse_color(text):
+    """Return a RL color object for the color string `text`, or None.
+
+    Results are cached, so the returned object must not be modified.
+    """
+    if len(text) in (7, 9) and text[0] == '#':
+        color = colors.HexColor(text, hasAlpha=len(text) == 9)
+    elif len(text) == 4 and text[0] == '#':
+        color = colors.HexColor('#' + 2*text[1] + 2*text[2] + 2*text[3])
+    elif len(text) == 5 and text[0] == '#':
+        color = colors.HexColor(
+            '#' + 2*text[1] + 2*text[2] + 2*text[3] + 2*text[4], hasAlpha=True
+        )
+    else:
+        # Should handle pcmyk|cmyk|rgb|hsl values (including 'a' for alpha)
+        color = colors.cssParse(text)
+        if color is None:
+            # Test if text is a predefined color constant
+            try:
+                color = getattr(colors, text).clone()
+            except AttributeError:
+                pass
+    return color
+
+
 def nudge_points(points):
     """ Nudge first coordinate if all coordinate pairs are identical.
 
@@ -1426,10 +1504,12 @@ def nudge_points(points):
         return
     x = points[0]
     y = points[1]
-    for i in range(2, len(points)-1, 2):
-        if x != points[i] or y != points[i+1]:
-            break
-    else:
+    if x != points[2] or y != points[3]:
+        return
+    # Counting on the x/y slices keeps the scan in C (works for lists as well
+    # as for array.array sequences).
+    n = len(points) // 2
+    if points[0::2].count(x) == n and points[1::2].count(y) == n:
         # All points were identical, so we nudge.
         points[0] *= 1.0000001
 
@@ -1462,7 +1542,7 @@ def iter_text_node(node, preserve_space, level=0):
     """
     level0 = level == 0
     text = clean_text(
-        node.text, preserve_space, strip_start=level0, strip_end=(level0 and len(node.getchildren()) == 0)
+        node.text, preserve_space, strip_start=level0, strip_end=(level0 and len(node.etree_element) == 0)
     ) if node.text else None
 
     yield node, text, False
@@ -1500,6 +1580,274 @@ def copy_shape_properties(source_shape, dest_shape):
             pass
 
 
+def copy_shape_state(source_shape, shared=()):
+    """
+    Return a copy of the instance dictionary of `source_shape`.
+
+    Only mutable values (lists like points/operators, and colors) are copied,
+    which is much cheaper than a deep copy for shapes with many points.
+    Values of the attributes named in `shared` are not copied at all.
+    """
+    state = {}
+    for key, value in source_shape.__dict__.items():
+        if key in shared:
+            pass
+        elif isinstance(value, list):
+            value = list(value)
+        elif isinstance(value, colors.Color):
+            value = value.clone()
+        state[key] = value
+    return state
+
+
+# Groups of SVG path operators.
+MOVE_OPS = frozenset('Mm')
+CLOSE_OPS = frozenset('Zz')
+CUBIC_OPS = frozenset('CcSs')
+QUADRATIC_OPS = frozenset('QqTt')
+
+
+class PathState:
+    """State shared by the path operator functions while building a Path.
+
+    The current point and the last control points are kept here so that
+    the operators don't need to slice them back out of the path points.
+    """
+
+    __slots__ = (
+        'x', 'y', 'subpath_start', 'lastop', 'last_cubic_cp', 'last_quadratic_cp',
+    )
+
+    def __init__(self):
+        # As in SVG, the current point starts at the origin.
+        self.x = self.y = 0.0
+        self.subpath_start = (0.0, 0.0)
+        self.lastop = ''
+        self.last_cubic_cp = None
+        self.last_quadratic_cp = None
+
+
+def path_move_to(path, nums, state):
+    state.x, state.y = nums
+    path.moveTo(state.x, state.y)
+    state.subpath_start = (state.x, state.y)
+
+
+def path_move_to_rel(path, nums, state):
+    if state.lastop in CLOSE_OPS:
+        x0, y0 = state.subpath_start
+    else:
+        x0, y0 = state.x, state.y
+    state.x, state.y = x0 + nums[0], y0 + nums[1]
+    path.moveTo(state.x, state.y)
+    state.subpath_start = (state.x, state.y)
+
+
+def path_line_to(path, nums, state):
+    state.x, state.y = nums
+    path.lineTo(state.x, state.y)
+
+
+def path_line_to_rel(path, nums, state):
+    state.x += nums[0]
+    state.y += nums[1]
+    path.lineTo(state.x, state.y)
+
+
+def path_hline_to(path, nums, state):
+    state.x = nums[0]
+    path.lineTo(state.x, state.y)
+
+
+def path_hline_to_rel(path, nums, state):
+    state.x += nums[0]
+    path.lineTo(state.x, state.y)
+
+
+def path_vline_to(path, nums, state):
+    state.y = nums[0]
+    path.lineTo(state.x, state.y)
+
+
+def path_vline_to_rel(path, nums, state):
+    state.y += nums[0]
+    path.lineTo(state.x, state.y)
+
+
+def path_curve_to(path, nums, state):
+    x1, y1, x2, y2, xn, yn = nums
+    path.curveTo(x1, y1, x2, y2, xn, yn)
+    state.last_cubic_cp = (x2, y2)
+    state.x, state.y = xn, yn
+
+
+def path_curve_to_rel(path, nums, state):
+    xp, yp = state.x, state.y
+    x1, y1, x2, y2, xn, yn = nums
+    x2, y2, xn, yn = xp + x2, yp + y2, xp + xn, yp + yn
+    path.curveTo(xp + x1, yp + y1, x2, y2, xn, yn)
+    state.last_cubic_cp = (x2, y2)
+    state.x, state.y = xn, yn
+
+
+def smooth_cubic_cp(state):
+    "Return the reflection of the last cubic control point, if any."
+    x0, y0 = state.x, state.y
+    if state.last_cubic_cp is None:
+        return x0, y0
+    xp, yp = state.last_cubic_cp
+    return x0 + (x0 - xp), y0 + (y0 - yp)
+
+
+def path_smooth_curve_to(path, nums, state):
+    x2, y2, xn, yn = nums
+    xi, yi = smooth_cubic_cp(state)
+    path.curveTo(xi, yi, x2, y2, xn, yn)
+    state.last_cubic_cp = (x2, y2)
+    state.x, state.y = xn, yn
+
+
+def path_smooth_curve_to_rel(path, nums, state):
+    x0, y0 = state.x, state.y
+    x2, y2, xn, yn = nums
+    x2, y2, xn, yn = x0 + x2, y0 + y2, x0 + xn, y0 + yn
+    xi, yi = smooth_cubic_cp(state)
+    path.curveTo(xi, yi, x2, y2, xn, yn)
+    state.last_cubic_cp = (x2, y2)
+    state.x, state.y = xn, yn
+
+
+def quad_curve_to(path, state, qx, qy, xn, yn):
+    "Add a quadratic bezier from the current point as a cubic one."
+    # Same computation as convert_quadratic_to_cubic_path, on flat floats.
+    x0, y0 = state.x, state.y
+    state.last_quadratic_cp = (qx, qy)
+    x1, y1 = x0 + 2 / 3 * (qx - x0), y0 + 2 / 3 * (qy - y0)
+    x2, y2 = x1 + 1 / 3 * (xn - x0), y1 + 1 / 3 * (yn - y0)
+    path.curveTo(x1, y1, x2, y2, xn, yn)
+    state.x, state.y = xn, yn
+
+
+def smooth_quad_cp(state):
+    "Return the reflection of the last quadratic control point, if any."
+    x0, y0 = state.x, state.y
+    if state.last_quadratic_cp is None:
+        return x0, y0
+    xp, yp = state.last_quadratic_cp
+    return x0 + (x0 - xp), y0 + (y0 - yp)
+
+
+def path_quad_to(path, nums, state):
+    quad_curve_to(path, state, *nums)
+
+
+def path_quad_to_rel(path, nums, state):
+    x0, y0 = state.x, state.y
+    x1, y1, xn, yn = nums
+    quad_curve_to(path, state, x0 + x1, y0 + y1, x0 + xn, y0 + yn)
+
+
+def path_smooth_quad_to(path, nums, state):
+    xn, yn = nums
+    quad_curve_to(path, state, *smooth_quad_cp(state), xn, yn)
+
+
+def path_smooth_quad_to_rel(path, nums, state):
+    xn, yn = nums
+    quad_curve_to(path, state, *smooth_quad_cp(state), state.x + xn, state.y + yn)
+
+
+def path_arc_to(path, nums, state, relative=False):
+    rx, ry, phi, fA, fS, x2, y2 = nums
+    x1, y1 = state.x, state.y
+    if relative:
+        x2 += x1
+        y2 += y1
+    if abs(rx) <= 1e-10 or abs(ry) <= 1e-10:
+        path.lineTo(x2, y2)
+        state.x, state.y = x2, y2
+    else:
+        bp = bezier_arc_from_end_points(x1, y1, rx, ry, phi, fA, fS, x2, y2)
+        for _, _, x1, y1, x2, y2, xn, yn in bp:
+            path.curveTo(x1, y1, x2, y2, xn, yn)
+            state.x, state.y = xn, yn
+
+
+def path_arc_to_rel(path, nums, state):
+    path_arc_to(path, nums, state, relative=True)
+
+
+def path_close(path, nums, state):
+    path.closePath()
+
+
+# Map SVG path operators to functions adding them to a RLG Path.
+PATH_OPS = {
+    'M': path_move_to, 'm': path_move_to_rel,
+    'L': path_line_to, 'l': path_line_to_rel,
+    'H': path_hline_to, 'h': path_hline_to_rel,
+    'V': path_vline_to, 'v': path_vline_to_rel,
+    'C': path_curve_to, 'c': path_curve_to_rel,
+    'S': path_smooth_curve_to, 's': path_smooth_curve_to_rel,
+    'Q': path_quad_to, 'q': path_quad_to_rel,
+    'T': path_smooth_quad_to, 't': path_smooth_quad_to_rel,
+    'A': path_arc_to, 'a': path_arc_to_rel,
+    'Z': path_close, 'z': path_close,
+}
+
+
+def apply_scale(group, values):
+    if not isinstance(values, tuple):
+        values = (values, values)
+    group.scale(*values)
+
+
+def apply_translate(group, values):
+    if not isinstance(values, tuple):
+        # From the SVG spec: If <ty> is not provided, it is assumed to be zero.
+        values = values, 0
+    group.translate(*values)
+
+
+def apply_rotate(group, values):
+    if not isinstance(values, tuple):
+        group.rotate(values)
+    elif len(values) == 3:
+        # Rotation around (cx, cy), composed into a single matrix:
+        # translate(cx, cy) rotate(angle) translate(-cx, -cy)
+        angle, cx, cy = values
+        a, b, c, d, _, _ = rotate(angle)
+        group.transform = mmult(
+            group.transform, (a, b, c, d, cx - a * cx - c * cy, cy - b * cx - d * cy)
+        )
+
+
+def apply_skew_x(group, values):
+    group.skew(values, 0)
+
+
+def apply_skew_y(group, values):
+    group.skew(0, values)
+
+
+def apply_matrix(group, values):
+    if isinstance(values, tuple) and len(values) == 6:
+        group.transform = mmult(group.transform, values)
+    else:
+        logger.debug("Ignoring transform: matrix %s", values)
+
+
+# Map SVG transform operations to functions applying them on a RLG Group.
+TRANSFORM_OPS = {
+    "scale": apply_scale,
+    "translate": apply_translate,
+    "rotate": apply_rotate,
+    "skewX": apply_skew_x,
+    "skewY": apply_skew_y,
+    "matrix": apply_matrix,
+}
+
+
 def monkeypatch_reportlab():
     """
     https://bitbucket.org/rptlab/reportlab/issues/95/
@@ -1509,6 +1857,10 @@ def monkeypatch_reportlab():
     from reportlab.pdfgen.canvas import Canvas
     from reportlab.graphics import shapes
 
+    if getattr(shapes._renderPath, '_svglib_patched', False):
+        # Already patched, e.g. when this module is reloaded.
+        return
+
     original_renderPath = shapes._renderPath
 
     def patchedRenderPath(path, drawFuncs, **kwargs):
@@ -1519,6 +1871,7 @@ def monkeypatch_reportlab():
         except AttributeError:
             pass
         return original_renderPath(path, drawFuncs, **kwargs)
+    patchedRenderPath._svglib_patched = True
     shapes._renderPath = patchedRenderPath
 
     original_drawPath = Canvas.drawPath
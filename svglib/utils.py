@@ -2,11 +2,60 @@
 This is a collection of utilities used by the ``svglib`` code module.
 """
 
+import logging
 import re
 from math import acos, ceil, copysign, cos, degrees, fabs, hypot, radians, sin, sqrt
 
 from reportlab.graphics.shapes import mmult, rotate, translate, transformPoint
 
+logger = logging.getLogger(__name__)
+
+float_re = r'(-?\d*\.?\d*(?:[eE][+-]?\d+)?)'
+flag_re = r'([1|0])'
+# 3 numb, 2 flags, 1 coord pair
+arc_seq_re = r'[\s,]*'.join([
+    float_re, float_re, float_re, flag_re, flag_re, float_re, float_re
+]) + r'[\s,]*'
+
+# Unlike float_re, never matches an empty string (or a lone sign/dot).
+number_re = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+
+# Numbers, or single stray characters which are not separators.
+find_number_tokens = re.compile(number_re + r'|[^\s,]').findall
+match_number = re.compile(number_re).fullmatch
+iter_arc_values = re.compile(arc_seq_re).finditer
+split_path_ops = re.compile('([achlmqstvz])', flags=re.I).split
+
+# SVG path operator codes mapped to the minimum number of expected arguments
+path_op_arity = {
+    'A': 7, 'a': 7,
+    'Q': 4, 'q': 4, 'T': 2, 't': 2, 'S': 4, 's': 4,
+    'M': 2, 'L': 2, 'm': 2, 'l': 2, 'H': 1, 'V': 1,
+    'h': 1, 'v': 1, 'C': 6, 'c': 6, 'Z': 0, 'z': 0,
+}
+
+
+def iter_float_groups(op, min_num, value):
+    """Iterate over the (operator, arguments) groups of a list of numbers.
+
+    `value` is a list of numbers as a string, split in groups of `min_num`
+    float numbers. A `m` or `M` operation is turned into `l` or `L` after
+    the first group.
+    Example: with op='m' and value='10,20 30,40,' the yielded values will be
+             ('m', [10.0, 20.0]), ('l', [30.0, 40.0])
+    """
+    tokens = find_number_tokens(value)
+    try:
+        floats = list(map(float, tokens))
+    except ValueError:
+        # e.g. a lone '-' or '.', that must not silently change a sign.
+        logger.warning("Ignoring unexpected characters in path data: %r", value)
+        floats = [float(token) for token in tokens if match_number(token)]
+    for i in range(0, len(floats), min_num):
+        if i > 0 and op in {'m', 'M'}:
+            op = 'l' if op == 'm' else 'L'
+        yield op, floats[i:i + min_num]
+
 
 def split_floats(op, min_num, value):
     """Split `value`, a list of numbers as a string, to a list of float numbers.
@@ -16,58 +65,34 @@ def split_floats(op, min_num, value):
     Example: with op='m' and value='10,20 30,40,' the returned value will be
              ['m', [10.0, 20.0], 'l', [30.0, 40.0]]
     """
-    floats = [float(seq) for seq in re.findall(r'(-?\d*\.?\d*(?:[eE][+-]?\d+)?)', value) if seq]
     res = []
-    for i in range(0, len(floats), min_num):
-        if i > 0 and op in {'m', 'M'}:
-            op = 'l' if op == 'm' else 'L'
-        res.extend([op, floats[i:i + min_num]])
+    for group in iter_float_groups(op, min_num, value):
+        res.extend(group)
     return res
 
 
 def split_arc_values(op, value):
-    float_re = r'(-?\d*\.?\d*(?:[eE][+-]?\d+)?)'
-    flag_re = r'([1|0])'
-    # 3 numb, 2 flags, 1 coord pair
-    a_seq_re = r'[\s,]*'.join([
-        float_re, float_re, float_re, flag_re, flag_re, float_re, float_re
-    ]) + r'[\s,]*'
     res = []
-    for seq in re.finditer(a_seq_re, value.strip()):
+    for seq in iter_arc_values(value.strip()):
         res.extend([op, [float(num) for num in seq.groups()]])
     return res
 
 
-def normalise_svg_path(attr):
-    """Normalise SVG path.
+def iter_svg_path(attr):
+    """Iterate over the (operator, arguments) pairs of a SVG path.
 
-    This basically introduces operator codes for multi-argument
-    parameters. Also, it fixes sequences of consecutive M or m
-    operators to MLLL... and mlll... operators. It adds an empty
-    list as argument for Z and z only in order to make the resul-
-    ting list easier to iterate over.
+    See normalise_svg_path() for the normalisation being applied.
 
-    E.g. "M 10 20, M 20 20, L 30 40, 40 40, Z"
-      -> ['M', [10, 20], 'L', [20, 20], 'L', [30, 40], 'L', [40, 40], 'Z', []]
+    E.g. "M 10 20, 30 40 Z" -> ('M', [10, 20]), ('L', [30, 40]), ('Z', [])
     """
 
-    # operator codes mapped to the minimum number of expected arguments
-    ops = {
-        'A': 7, 'a': 7,
-        'Q': 4, 'q': 4, 'T': 2, 't': 2, 'S': 4, 's': 4,
-        'M': 2, 'L': 2, 'm': 2, 'l': 2, 'H': 1, 'V': 1,
-        'h': 1, 'v': 1, 'C': 6, 'c': 6, 'Z': 0, 'z': 0,
-    }
-    op_keys = ops.keys()
+    ops = path_op_arity
 
     # do some preprocessing
-    result = []
-    groups = re.split('([achlmqstvz])', attr.strip(), flags=re.I)
-    op = None
+    groups = split_path_ops(attr.strip())
+    op = last_op = None
     for item in groups:
-        if item.strip() == '':
-            continue
-        if item in op_keys:
+        if item in ops:
             # fix sequences of M to one M plus a sequence of L operators,
             # same for m and l.
             if item == 'M' and item == op:
@@ -77,14 +102,38 @@ def normalise_svg_path(attr):
             else:
                 op = item
             if ops[op] == 0:  # Z, z
-                result.extend([op, []])
+                last_op = op
+                yield op, []
+        elif item.strip() == '':
+            continue
         else:
-            if op.lower() == 'a':
-                result.extend(split_arc_values(op, item))
+            if op in {'a', 'A'}:
+                values = split_arc_values(op, item)
+                for i in range(0, len(values), 2):
+                    last_op = values[i]
+                    yield last_op, values[i + 1]
             else:
-                result.extend(split_floats(op, ops[op], item))
-            op = result[-2]  # Remember last op
+                for last_op, values in iter_float_groups(op, ops[op], item):
+                    yield last_op, values
+            op = last_op  # Remember last op
+
 
+def normalise_svg_path(attr):
+    """Normalise SVG path.
+
+    This basically introduces operator codes for multi-argument
+    parameters. Also, it fixes sequences of consecutive M or m
+    operators to MLLL... and mlll... operators. It adds an empty
+    list as argument for Z and z only in order to make the resul-
+    ting list easier to iterate over.
+
+    E.g. "M 10 20, M 20 20, L 30 40, 40 40, Z"
+      -> ['M', [10, 20], 'L', [20, 20], 'L', [30, 40], 'L', [40, 40], 'Z', []]
+    """
+
+    result = []
+    for op, nums in iter_svg_path(attr):
+        result.extend([op, nums])
     return result
 
 
@@ -252,14 +301,17 @@ def bezier_arc_from_end_points(x1, y1, rx, ry, phi, fA, fS, x2, y2):
         )
         bp = bezier_arc_from_centre(cx, cy, rx, ry, start_ang, extent)
         # Re-rotate by the desired angle and add back the translation
-        mx = mmult(translate(x1, y1), rotate(phi))
-        res = []
-        for x1, y1, x2, y2, x3, y3, x4, y4 in bp:
-            res.append(
-                transformPoint(mx, (x1, y1)) + transformPoint(mx, (x2, y2)) +
-                transformPoint(mx, (x3, y3)) + transformPoint(mx, (x4, y4))
+        # (the matrix is applied inline, as in transformPoint()).
+        a, b, c, d, e, f = mmult(translate(x1, y1), rotate(phi))
+        return [
+            (
+                a * x1 + c * y1 + e, b * x1 + d * y1 + f,
+                a * x2 + c * y2 + e, b * x2 + d * y2 + f,
+                a * x3 + c * y3 + e, b * x3 + d * y3 + f,
+                a * x4 + c * y4 + e, b * x4 + d * y4 + f,
             )
-        return res
+            for x1, y1, x2, y2, x3, y3, x4, y4 in bp
+        ]
     else:
         cx, cy, rx, ry, start_ang, extent = end_point_to_center_parameters(
             x1, y1, x2, y2, fA, fS, rx, ry
@@ -8,15 +8,19 @@ inside the test directory:
     py.test -v -s test_basic.py
 """
 
+import array
+import gzip
 import io
 import os
 import pathlib
+import pickle
 import textwrap
 from tempfile import NamedTemporaryFile
 
 from reportlab.graphics.shapes import (
     _CLOSEPATH, _CURVETO, _LINETO, _MOVETO, Group, Path, Polygon, PolyLine, Rect, Line,
 )
+from reportlab.graphics import renderPDF
 from reportlab.lib import colors
 from reportlab.lib.units import cm, inch
 from reportlab.pdfgen.canvas import FILL_EVEN_ODD
@@ -92,6 +96,49 @@ class TestSvg2rlgInput:
         finally:
             os.unlink(file_path)
 
+    def test_svgz_input(self):
+        try:
+            with NamedTemporaryFile(mode='wb', suffix='.svgz', delete=False) as fp:
+                fp.write(gzip.compress(self.test_content.encode()))
+                file_path = fp.name
+            drawing = svglib.svg2rlg(file_path)
+            assert drawing is not None
+            # No decompressed copy is written next to the original file
+            assert not os.path.exists(file_path[:-1])
+        finally:
+            os.unlink(file_path)
+
+    def test_many_inputs(self):
+        file_paths = []
+        try:
+            for _ in range(3):
+                with NamedTemporaryFile(mode='w', suffix='.svg', delete=False) as fp:
+                    fp.write(self.test_content)
+                    file_paths.append(fp.name)
+            drawings = svglib.svg2rlg_many(file_paths, workers=2)
+            assert len(drawings) == 3
+            assert all(drawing.width == 1200 for drawing in drawings)
+        finally:
+            for file_path in file_paths:
+                os.unlink(file_path)
+
+    def test_many_inputs_with_ttf_font(self):
+        """The fonts found while converting can be used to render the drawings."""
+        content = textwrap.dedent("""\
+            <?xml version="1.0"?>
+            <svg width="200" height="100" xmlns="http://www.w3.org/2000/svg">
+              <text x="10" y="50" font-family="Vera">Hello</text>
+            </svg>
+        """)
+        with NamedTemporaryFile(mode='w', suffix='.svg', delete=False) as fp:
+            fp.write(content)
+        try:
+            drawing, = svglib.svg2rlg_many([fp.name], workers=1)
+        finally:
+            os.unlink(fp.name)
+        assert drawing.contents[0].contents[0].contents[0].fontName == 'Vera'
+        assert renderPDF.drawToString(drawing)
+
 
 class TestPaths:
     """Testing path-related code."""
@@ -165,6 +212,13 @@ class TestPaths:
         failed = _testit(utils.normalise_svg_path, mapping)
         assert len(failed) == 0
 
+    def test_path_normalisation_stray_chars(self, caplog):
+        assert utils.normalise_svg_path("M+1-2 L+5+3") == ["M", [1, -2], "L", [5, 3]]
+        assert caplog.text == ""
+        # A lone sign is skipped, but not silently
+        assert utils.normalise_svg_path("M0 0 L - 5 3") == ["M", [0, 0], "L", [5, 3]]
+        assert "Ignoring unexpected characters in path data: ' - 5 3'" in caplog.text
+
     def test_relative_move_after_closepath(self):
         """
         A relative subpath is relative to the point *after* the previous
@@ -211,11 +265,29 @@ class TestPaths:
         closed_path = group.contents[0]
         unclosed_path = group.contents[1]
         assert len(closed_path.points) == len(unclosed_path.points)
+        # Points are not copied, as only the operators differ.
+        assert closed_path.points is unclosed_path.points
         assert closed_path.operators == [
             _MOVETO, _LINETO, _LINETO, _CLOSEPATH, _MOVETO, _LINETO, _CLOSEPATH]
         assert unclosed_path.operators == [
             _MOVETO, _LINETO, _LINETO, _MOVETO, _LINETO]
 
+    def test_path_without_initial_moveto(self, caplog):
+        """Path commands before the first moveto are ignored."""
+        drawing = drawing_from_svg('''
+            <?xml version="1.0"?>
+            <svg xmlns="http://www.w3.org/2000/svg" width="30" height="30">
+                <path d="H 10 V 20" fill="none" stroke="black"/>
+                <path d="V 20 m 5 5 h 10" fill="none" stroke="black"/>
+            </svg>
+        ''')
+        assert "Ignoring path commands before the first moveto" in caplog.text
+        # The first path has no moveto at all
+        assert len(drawing.contents[0].contents) == 1
+        path = drawing.contents[0].contents[0].contents[0]
+        assert path.points == [5.0, 5.0, 15.0, 5.0]
+        assert renderPDF.drawToString(drawing).startswith(b'%PDF')
+
     def test_empty_path(self):
         converter = svglib.Svg2RlgShapeConverter(None)
         node = minimal_svg_node('<path id="W"/>')
@@ -296,6 +368,14 @@ class TestColorAttrConverter:
         failed = _testit(ac.convertColor, mapping)
         assert len(failed) == 0
 
+    def test_converted_colors_not_shared(self):
+        ac = svglib.Svg2RlgAttributeConverter()
+        color1 = ac.convertColor("#ff0000")
+        color1.alpha = 0.5
+        color2 = ac.convertColor("#ff0000")
+        assert color2 is not color1
+        assert color2.alpha == 1
+
 
 class TestLengthAttrConverter:
     "Testing length attribute conversion."
@@ -342,6 +422,8 @@ class TestLengthAttrConverter:
         mapping = (
             (" 5cm 5in", [5*cm, 5*inch]),
             (" 5, 5", [5, 5]),
+            ("1,2\n3\t,4 ", [1, 2, 3, 4]),
+            ("", []),
         )
         ac = svglib.Svg2RlgAttributeConverter()
         failed = _testit(ac.convertLengthList, mapping)
@@ -381,6 +463,9 @@ class TestAttrConverter:
         mapping = (
             ("fill: black; stroke: yellow",
                 {"fill": "black", "stroke": "yellow"}),
+            ("fill:black;;stroke:yellow; ",
+                {"fill": "black", "stroke": "yellow"}),
+            ("font-family: 'a:b'", {"font-family": "'a:b'"}),
         )
         ac = svglib.Svg2RlgAttributeConverter()
         failed = _testit(ac.parseMultiAttributes, mapping)
@@ -501,6 +586,18 @@ class TestApplyTransformOnGroup:
         converter.applyTransformOnGroup(transform, group)
         assert group.transform == (3, 1, -1, 3, 70, 80)
 
+    def test_rotate_around_point(self):
+        group = Group()
+        converter = svglib.Svg2RlgShapeConverter(None)
+        converter.applyTransformOnGroup("rotate(90 10 20)", group)
+        assert group.transform == pytest.approx((0, 1, -1, 0, 30, 10))
+
+    def test_unknown_operation(self):
+        group = Group()
+        converter = svglib.Svg2RlgShapeConverter(None)
+        converter.applyTransformOnGroup("perspective(2) scale(2)", group)
+        assert group.transform == (2, 0, 0, 2, 0, 0)
+
 
 class TestStyleSheets:
     def test_css_stylesheet(self):
@@ -843,6 +940,19 @@ class TestPolylineNode:
         polyline = converter.convertPolyline(node)
         assert polyline is None
 
+    def test_nudge_points(self):
+        points = [10, 50, 10, 50, 10, 50]
+        svglib.nudge_points(points)
+        assert points[0] != 10
+        # Only the last point differs, nothing to nudge.
+        points = [10, 50, 10, 50, 10, 51]
+        svglib.nudge_points(points)
+        assert points == [10, 50, 10, 50, 10, 51]
+        # Any mutable sequence of numbers is supported.
+        points = array.array('d', [10, 50, 10, 50])
+        svglib.nudge_points(points)
+        assert points[0] != 10
+
 
 class TestPolygonNode:
     def test_length_zero(self):
@@ -894,6 +1004,40 @@ class TestUseNode:
         assert isinstance(main_group.contents[2].contents[0], Rect)
         assert main_group.contents[2].contents[0].fillColor == colors.red
 
+    def test_use_position(self):
+        drawing = drawing_from_svg('''
+            <svg xmlns="http://www.w3.org/2000/svg"
+                 xmlns:xlink="http://www.w3.org/1999/xlink"
+                 width="10cm" height="3cm" viewBox="0 0 100 30">
+              <defs>
+                  <rect id="MyRect" width="60" height="10"/>
+              </defs>
+              <use x="20" y="10" transform="scale(2)" xlink:href="#MyRect" />
+              <use x="1cm" xlink:href="#MyRect" />
+            </svg>
+        ''')
+        main_group = drawing.contents[0]
+        assert main_group.contents[0].transform == (2, 0, 0, 2, 40, 20)
+        assert main_group.contents[1].transform == (1, 0, 0, 1, cm, 0)
+
+    def test_use_invalid_position(self, caplog):
+        drawing = drawing_from_svg('''
+            <svg xmlns="http://www.w3.org/2000/svg"
+                 xmlns:xlink="http://www.w3.org/1999/xlink"
+                 width="10cm" height="3cm" viewBox="0 0 100 30">
+              <defs>
+                  <rect id="MyRect" width="60" height="10"/>
+              </defs>
+              <use x="bad" y="10" xlink:href="#MyRect" />
+              <use x="20" xlink:href="#MyRect" />
+            </svg>
+        ''')
+        assert "Ignoring invalid x/y position on use" in caplog.text
+        # The rest of the document is still rendered
+        main_group = drawing.contents[0]
+        assert main_group.contents[0].transform == (1, 0, 0, 1, 0, 0)
+        assert main_group.contents[1].transform == (1, 0, 0, 1, 20, 0)
+
     def test_use_href_svg2(self):
         """In SVG 2, xlink:href="" can be simply href=""."""
         drawing = drawing_from_svg('''
@@ -925,6 +1069,25 @@ class TestUseNode:
             </svg>
         ''')
 
+    def test_use_with_nested_defs_at_end(self):
+        self.test_use(drawing_source='''
+            <?xml version="1.0"?>
+            <svg version="1.1"
+                 xmlns="http://www.w3.org/2000/svg"
+                 xmlns:xlink="http://www.w3.org/1999/xlink"
+                 width="10cm" height="3cm" viewBox="0 0 100 30">
+              <rect x=".1" y=".1" width="99.8" height="29.8"
+                    fill="none" stroke="blue" stroke-width=".2" />
+              <use x="20" y="10" xlink:href="#MyRect" />
+              <use x="30" y="20" xlink:href="#MyRect" fill="#f00" />
+              <g><g>
+                <defs>
+                  <rect id="MyRect" width="60" height="10"/>
+                </defs>
+              </g></g>
+            </svg>
+        ''')
+
     def test_transform_inherited_by_use(self):
         drawing = drawing_from_svg('''
             <?xml version="1.0"?>
@@ -1138,3 +1301,52 @@ class TestEmbedded:
         # FIXME: test the error log when we can require pytest >= 3.4
         # No image as relative path in file-like input cannot be determined.
         assert drawing.contents[0].contents == []
+
+    def test_embedded_png_loaded_lazily(self):
+        drawing = drawing_from_svg('''
+            <?xml version="1.0"?>
+            <svg xmlns="http://www.w3.org/2000/svg" version="1.1"
+                 xmlns:xlink="http://www.w3.org/1999/xlink" height="20" width="20">
+              <image height="2" width="2" xlink:href="data:image/png;base64,iVBORw0KGgoAAAANSU\
+hEUgAAAAIAAAACCAIAAAD91JpzAAAAFklEQVR4nGP8z8DAwMDAxMDAwMDAAAANHQEDasKb6QAAAABJRU5ErkJggg=="/>
+            </svg>
+        ''')
+        image = drawing.contents[0].contents[0].contents[0]
+        assert isinstance(image, svglib.LazyImage)
+        # Image data is only decoded on first access.
+        assert image.__dict__['path'].startswith('data:image/png;base64,')
+        assert image.path.size == (2, 2)
+        assert image.path is image.__dict__['path']
+
+    def test_embedded_image_decode_error(self, caplog):
+        drawing = drawing_from_svg('''
+            <?xml version="1.0"?>
+            <svg xmlns="http://www.w3.org/2000/svg" version="1.1"
+                 xmlns:xlink="http://www.w3.org/1999/xlink" height="20" width="20">
+              <image height="2" width="2" xlink:href="data:image/png;base64,bm90IGEgUE5H"/>
+            </svg>
+        ''')
+        image = drawing.contents[0].contents[0].contents[0]
+        assert image.path is None
+        assert "Unable to decode the embedded image of <image> at line 5" in caplog.text
+        # Renderers skip the image
+        assert renderPDF.drawToString(drawing).startswith(b'%PDF')
+
+    def test_embedded_image_decoded_once(self):
+        data_uri = (
+            "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAIAAAACCAIAAAD91JpzAAAAFklEQVR4"
+            "nGP8z8DAwMDAxMDAwMDAAAANHQEDasKb6QAAAABJRU5ErkJggg=="
+        )
+        drawing = drawing_from_svg(f'''
+            <?xml version="1.0"?>
+            <svg xmlns="http://www.w3.org/2000/svg" version="1.1"
+                 xmlns:xlink="http://www.w3.org/1999/xlink" height="20" width="20">
+              <image height="2" width="2" xlink:href="{data_uri}"/>
+              <image x="4" height="2" width="2" xlink:href="{data_uri}"/>
+            </svg>
+        ''')
+        image1, image2 = [gr.contents[0] for gr in drawing.contents[0].contents]
+        assert image1.path is image2.path
+        # Lazy images are resolved when pickled
+        image = pickle.loads(pickle.dumps(image1))
+        assert image.path.size == (2, 2)